@@ -1,5 +1,5 @@
 # %%
-from typing import Dict, TypedDict, Literal
+from typing import Dict, Literal
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END, START
 from langchain_core.prompts import ChatPromptTemplate
@@ -7,31 +7,22 @@ from dotenv import load_dotenv
 import os
 from IPython.display import display, Image
 from langchain_core.runnables.graph import MermaidDrawMethod
+from nodedesk_state import NodeDeskState, route_query, run_workflow
 
 ## Logging to understand the problems
 import logging
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("nodedesk")
 
 
 # Loading the environment variables
 load_dotenv()
 os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY") or ""
 # %%
-# Defining the structure state of the node desk
-class NodeDeskState(TypedDict):
-    query: str | None
-    is_technical: bool | None
-    it_category: str | None
-    satisfaction_level: str | None
-    answer: str | None
-    ticket_created: bool | None
-    interaction_count: int | None
-
-# %%
 
 # Nodes functions
 # 1 - Check if the query is technical (IT context)
-def check_technical_context(state: NodeDeskState) -> NodeDeskState:
+def check_technical_context(state: NodeDeskState) -> dict:
     """Check if the query is in technical (IT) context"""
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful assistant that determines if a query is related to IT/technical context in a business/office environment.
@@ -59,24 +50,16 @@ def check_technical_context(state: NodeDeskState) -> NodeDeskState:
         ("user", "Query: {query}"),
     ])
     chain = prompt | ChatGroq(model="llama3-8b-8192", temperature=0.0)
-    response = chain.invoke({"query": state["query"]}).content
+    response = chain.invoke({"query": state.query}).content
     
     response_str = str(response)
     is_technical = "Non-Technical" not in response_str
     it_category = response_str if is_technical else "Non-Technical"
     
-    return {
-        "query": state["query"],
-        "is_technical": is_technical,
-        "it_category": it_category,
-        "satisfaction_level": state.get("satisfaction_level"),
-        "answer": state.get("answer"),
-        "ticket_created": state.get("ticket_created", False),
-        "interaction_count": state.get("interaction_count", 0) or 0
-    }
+    return {"is_technical": is_technical, "it_category": it_category}
 
 # 2 - Provide general response for non-technical queries
-def respond_general(state: NodeDeskState) -> NodeDeskState:
+def respond_general(state: NodeDeskState) -> dict:
     """Provide general response for non-technical queries"""
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful assistant that responds to non-technical queries.
@@ -86,20 +69,12 @@ def respond_general(state: NodeDeskState) -> NodeDeskState:
         ("user", "Query: {query}"),
     ])
     chain = prompt | ChatGroq(model="llama3-8b-8192", temperature=0.7)
-    response = chain.invoke({"query": state["query"]}).content
+    response = chain.invoke({"query": state.query}).content
     
-    return {
-        "query": state["query"],
-        "is_technical": state["is_technical"],
-        "it_category": state["it_category"],
-        "satisfaction_level": state.get("satisfaction_level"),
-        "answer": str(response),
-        "ticket_created": state.get("ticket_created", False),
-        "interaction_count": state.get("interaction_count", 0) or 0
-    }
+    return {"answer": str(response)}
 
 # 3 - Provide technical guidance
-def provide_technical_guidance(state: NodeDeskState) -> NodeDeskState:
+def provide_technical_guidance(state: NodeDeskState) -> dict:
     """Provide technical guidance for IT-related queries"""
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful IT support assistant that provides technical guidance.
@@ -118,20 +93,12 @@ def provide_technical_guidance(state: NodeDeskState) -> NodeDeskState:
         ("user", "IT Category: {it_category}"),
     ])
     chain = prompt | ChatGroq(model="llama3-8b-8192", temperature=0.3)
-    response = chain.invoke({"query": state["query"], "it_category": state["it_category"]}).content
+    response = chain.invoke({"query": state.query, "it_category": state.it_category}).content
     
-    return {
-        "query": state["query"],
-        "is_technical": state["is_technical"],
-        "it_category": state["it_category"],
-        "satisfaction_level": state.get("satisfaction_level"),
-        "answer": str(response),
-        "ticket_created": state.get("ticket_created", False),
-        "interaction_count": state.get("interaction_count", 0) or 0
-    }
+    return {"answer": str(response)}
 
 # 4 - Check user satisfaction
-def check_satisfaction(state: NodeDeskState) -> NodeDeskState:
+def check_satisfaction(state: NodeDeskState) -> dict:
     """Check if the user is satisfied with the provided guidance"""
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful assistant that determines user satisfaction.
@@ -145,20 +112,12 @@ def check_satisfaction(state: NodeDeskState) -> NodeDeskState:
         ("user", "User's response: {query}"),
     ])
     chain = prompt | ChatGroq(model="llama3-8b-8192", temperature=0.0)
-    response = chain.invoke({"query": state["query"]}).content
+    response = chain.invoke({"query": state.query}).content
     
-    return {
-        "query": state["query"],
-        "is_technical": state["is_technical"],
-        "it_category": state["it_category"],
-        "satisfaction_level": str(response),
-        "answer": state.get("answer"),
-        "ticket_created": state.get("ticket_created", False),
-        "interaction_count": state.get("interaction_count", 0) or 0
-    }
+    return {"satisfaction_level": str(response)}
 
 # 5 - Create resolved ticket
-def create_resolved_ticket(state: NodeDeskState) -> NodeDeskState:
+def create_resolved_ticket(state: NodeDeskState) -> dict:
     """Create a ticket marked as resolved by the agent"""
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful assistant that creates resolved tickets.
@@ -171,23 +130,15 @@ def create_resolved_ticket(state: NodeDeskState) -> NodeDeskState:
     ])
     chain = prompt | ChatGroq(model="llama3-8b-8192", temperature=0.0)
     response = chain.invoke({
-        "query": state["query"], 
-        "it_category": state["it_category"],
-        "answer": state["answer"]
+        "query": state.query, 
+        "it_category": state.it_category,
+        "answer": state.answer
     }).content
     
-    return {
-        "query": state["query"],
-        "is_technical": state["is_technical"],
-        "it_category": state["it_category"],
-        "satisfaction_level": state["satisfaction_level"],
-        "answer": state["answer"],
-        "ticket_created": True,
-        "interaction_count": state.get("interaction_count", 0) or 0
-    }
+    return {"ticket_created": True}
 
 # 6 - Create escalation ticket
-def create_escalation_ticket(state: NodeDeskState) -> NodeDeskState:
+def create_escalation_ticket(state: NodeDeskState) -> dict:
     """Create a ticket for escalation to human support"""
     prompt = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful assistant that creates escalation tickets.
@@ -200,103 +151,29 @@ def create_escalation_ticket(state: NodeDeskState) -> NodeDeskState:
     ])
     chain = prompt | ChatGroq(model="llama3-8b-8192", temperature=0.0)
     response = chain.invoke({
-        "query": state["query"], 
-        "it_category": state["it_category"],
-        "answer": state["answer"]
+        "query": state.query, 
+        "it_category": state.it_category,
+        "answer": state.answer
     }).content
     
-    return {
-        "query": state["query"],
-        "is_technical": state["is_technical"],
-        "it_category": state["it_category"],
-        "satisfaction_level": state["satisfaction_level"],
-        "answer": state["answer"],
-        "ticket_created": True,
-        "interaction_count": state.get("interaction_count", 0) or 0
-    }
+    return {"ticket_created": True}
 
 # %%
-# Routing function
-def route_query(state: NodeDeskState) -> str:
-    """Route the query to the correct node based on the current state"""
-    
-    # Force stop if too many interactions
-    interaction_count = state.get("interaction_count", 0) or 0
-    if interaction_count >= 5:  # Reduced limit to prevent infinite loops
-        return "create_escalation_ticket"
-    
-    # First interaction - check if technical
-    if state.get("is_technical") is None:
-        return "check_technical_context"
-    
-    # Non-technical query
-    if not state["is_technical"]:
-        return "respond_general"
-    
-    # Technical query - provide guidance
-    if state.get("answer") is None:
-        return "provide_technical_guidance"
-    
-    # Check satisfaction after providing guidance
-    if state.get("satisfaction_level") is None:
-        return "check_satisfaction"
-    
-    # Route based on satisfaction
-    if state["satisfaction_level"] == "Satisfied":
-        return "create_resolved_ticket"
-    elif state["satisfaction_level"] == "Unsatisfied":
-        return "create_escalation_ticket"
-    else:  # Neutral - escalate after too many attempts
-        return "create_escalation_ticket"
+# Node functions by name, shared by the workflow loop and the graph
+NODES = {
+    "check_technical_context": check_technical_context,
+    "respond_general": respond_general,
+    "provide_technical_guidance": provide_technical_guidance,
+    "check_satisfaction": check_satisfaction,
+    "create_resolved_ticket": create_resolved_ticket,
+    "create_escalation_ticket": create_escalation_ticket,
+}
 
 
 # Main workflow function
 def nodedesk_workflow(initial_query: str) -> NodeDeskState:
     """Main workflow for NodeDesk agent"""
-    
-    # Initialize state
-    state: NodeDeskState = {
-        "query": initial_query,
-        "is_technical": None,
-        "it_category": None,
-        "satisfaction_level": None,
-        "answer": None,
-        "ticket_created": False,
-        "interaction_count": 0
-    }
-    
-    # Execute workflow
-    while not state["ticket_created"]:
-        next_node = route_query(state)
-        print(f"\n➡️ Routing to: {next_node}")
-        print(f"🧠 Current State: {state}")
-        print(f"🔍 Current Interaction Count: {state.get('interaction_count', 0)}")
-        
-        if next_node == "check_technical_context":
-            state = check_technical_context(state)
-        elif next_node == "respond_general":
-            state = respond_general(state)
-        elif next_node == "provide_technical_guidance":
-            state = provide_technical_guidance(state)
-        elif next_node == "check_satisfaction":
-            state = check_satisfaction(state)
-        elif next_node == "create_resolved_ticket":
-            state = create_resolved_ticket(state)
-        elif next_node == "create_escalation_ticket":
-            state = create_escalation_ticket(state)
-        
-        current_count = state.get("interaction_count", 0) or 0
-        state["interaction_count"] = current_count + 1
-        
-        print(f"🔁 Interaction Count: {state['interaction_count']}")
-
-        # Prevent infinite loops
-        if state["interaction_count"] > 5:
-            print("🚨 Max interactions reached! Escalating...")
-            state = create_escalation_ticket(state)
-            break
-    
-    return state
+    return run_workflow(initial_query, NODES)
 
 # %%
 
@@ -357,13 +234,12 @@ def execute_nodedesk(query: str) -> dict:
         result = nodedesk_workflow(query)
         return {
             "query": query,
-            "it_category": result.get("it_category"),
-            "satisfaction_level": result.get("satisfaction_level"),
-            "answer": result.get("answer")
+            "it_category": result.it_category,
+            "satisfaction_level": result.satisfaction_level,
+            "answer": result.answer
         }
-    except Exception as e:
-        print("🚨 Exception caught:")
-        print(e)
+    except Exception:
+        logger.exception("nodedesk workflow failed query=%r", query)
         raise  # Optional: re-raise to propagate the error
 
 
@@ -1,8 +1,11 @@
 import streamlit as st
 import sys
 import os
+import time
 from datetime import datetime
 
+from ticket_analytics import TicketAnalytics
+
 # Add the path to your main.py if it's in a different directory
 # sys.path.append('path/to/your/main/directory')
 
@@ -80,12 +83,8 @@ st.markdown("""
 # Initialize session state
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
-if 'ticket_counter' not in st.session_state:
-    st.session_state.ticket_counter = 0
-if 'resolved_tickets' not in st.session_state:
-    st.session_state.resolved_tickets = 0
-if 'escalated_tickets' not in st.session_state:
-    st.session_state.escalated_tickets = 0
+if 'analytics' not in st.session_state:
+    st.session_state.analytics = TicketAnalytics()
 if 'pending_feedback' not in st.session_state:
     st.session_state.pending_feedback = []
 
@@ -95,12 +94,13 @@ st.markdown("<h1 class='main-header'>🖥️ NodeDesk IT Support Assistant</h1>"
 # Sidebar with stats and information
 with st.sidebar:
     st.header("📊 Session Statistics")
+    stats = st.session_state.analytics.snapshot()
     
     col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown(f"""
         <div class='stats-card'>
-            <h3 style='color: #1f2937; font-weight: bold;'>{st.session_state.ticket_counter}</h3>
+            <h3 style='color: #1f2937; font-weight: bold;'>{stats['total']}</h3>
             <p style='color: #4b5563; margin: 0.5rem 0 0 0;'>Total Tickets</p>
         </div>
         """, unsafe_allow_html=True)
@@ -108,7 +108,7 @@ with st.sidebar:
     with col2:
         st.markdown(f"""
         <div class='stats-card'>
-            <h3 style='color: #16a34a; font-weight: bold;'>{st.session_state.resolved_tickets}</h3>
+            <h3 style='color: #16a34a; font-weight: bold;'>{stats['by_status']['Resolved']}</h3>
             <p style='color: #4b5563; margin: 0.5rem 0 0 0;'>Resolved</p>
         </div>
         """, unsafe_allow_html=True)
@@ -116,11 +116,32 @@ with st.sidebar:
     with col3:
         st.markdown(f"""
         <div class='stats-card'>
-            <h3 style='color: #dc2626; font-weight: bold;'>{st.session_state.escalated_tickets}</h3>
+            <h3 style='color: #dc2626; font-weight: bold;'>{stats['by_status']['Escalated']}</h3>
             <p style='color: #4b5563; margin: 0.5rem 0 0 0;'>Escalated</p>
         </div>
         """, unsafe_allow_html=True)
     
+    if stats['total']:
+        st.caption(
+            f"Pending: {stats['by_status']['Pending']} · "
+            f"Awaiting feedback: {stats['by_status']['Open']} · "
+            f"Resolution rate: {stats['resolution_rate']:.0%}"
+        )
+        latency = stats['latency_ms']
+        st.caption(
+            f"Response time p50: {latency['p50'] / 1000:.1f}s · "
+            f"p90: {latency['p90'] / 1000:.1f}s · "
+            f"p99: {latency['p99'] / 1000:.1f}s"
+        )
+        st.markdown("**Tickets by category**")
+        st.bar_chart(stats['by_category'])
+        st.download_button(
+            "📥 Export Tickets (Parquet)",
+            data=st.session_state.analytics.to_parquet(),
+            file_name="nodedesk_tickets.parquet",
+            mime="application/vnd.apache.parquet"
+        )
+    
     st.markdown("---")
     
     st.header("ℹ️ How it works")
@@ -145,9 +166,7 @@ with st.sidebar:
     
     if st.button("🗑️ Clear Chat History", type="secondary"):
         st.session_state.chat_history = []
-        st.session_state.ticket_counter = 0
-        st.session_state.resolved_tickets = 0
-        st.session_state.escalated_tickets = 0
+        st.session_state.analytics.reset()
         st.rerun()
 
 # Main chat interface
@@ -185,7 +204,7 @@ if st.session_state.chat_history:
                 if st.button("✅ Yes, this helped!", key=f"satisfied_{i}", type="primary"):
                     st.session_state.chat_history[i]['satisfaction_level'] = 'Satisfied'
                     st.session_state.chat_history[i]['ticket_status'] = 'Resolved'
-                    st.session_state.resolved_tickets += 1
+                    st.session_state.analytics.update_status(chat['ticket_id'], 'Resolved', 'Satisfied')
                     st.success("Great! Ticket marked as resolved.")
                     st.rerun()
             
@@ -193,7 +212,7 @@ if st.session_state.chat_history:
                 if st.button("❌ No, still need help", key=f"unsatisfied_{i}", type="secondary"):
                     st.session_state.chat_history[i]['satisfaction_level'] = 'Unsatisfied'
                     st.session_state.chat_history[i]['ticket_status'] = 'Escalated'
-                    st.session_state.escalated_tickets += 1
+                    st.session_state.analytics.update_status(chat['ticket_id'], 'Escalated', 'Unsatisfied')
                     st.warning("Ticket escalated to human support.")
                     st.rerun()
             
@@ -201,6 +220,7 @@ if st.session_state.chat_history:
                 if st.button("❓ Need more info", key=f"neutral_{i}"):
                     st.session_state.chat_history[i]['satisfaction_level'] = 'Neutral'
                     st.session_state.chat_history[i]['ticket_status'] = 'Pending'
+                    st.session_state.analytics.update_status(chat['ticket_id'], 'Pending', 'Neutral')
                     st.info("You can ask a follow-up question below.")
                     st.rerun()
         
@@ -265,7 +285,9 @@ if submit_button and user_query.strip():
     with st.spinner("🤔 Processing your query..."):
         try:
             # Call your main workflow
+            started = time.perf_counter()
             result = execute_nodedesk(user_query.strip())
+            latency_ms = (time.perf_counter() - started) * 1000
             
             # Update session state
             chat_entry = {
@@ -273,17 +295,27 @@ if submit_button and user_query.strip():
                 'answer': result['answer'],
                 'it_category': result['it_category'],
                 'satisfaction_level': None,  # Will be set by user feedback
+                'ticket_status': 'Open',
                 'ticket_created': True,
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             
-            st.session_state.chat_history.append(chat_entry)
-            st.session_state.ticket_counter += 1
-            
             # For non-technical queries, auto-resolve
             if result['it_category'] == 'Non-Technical':
-                st.session_state.chat_history[-1]['satisfaction_level'] = 'Redirected'
-                st.session_state.resolved_tickets += 1
+                chat_entry['satisfaction_level'] = 'Redirected'
+                chat_entry['ticket_status'] = 'Resolved'
+            
+            # Record the ticket in the analytics as it is written
+            chat_entry['ticket_id'] = st.session_state.analytics.record_ticket(
+                query=chat_entry['query'],
+                answer=chat_entry['answer'],
+                it_category=chat_entry['it_category'],
+                status=chat_entry['ticket_status'],
+                satisfaction_level=chat_entry['satisfaction_level'],
+                latency_ms=latency_ms,
+                created_at=chat_entry['timestamp']
+            )
+            st.session_state.chat_history.append(chat_entry)
             
             # Show success message and rerun to display the new chat
             st.success("✅ Query processed successfully!")
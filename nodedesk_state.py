@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from typing import Callable, Dict
+import logging
+
+# Shared with main.py; set to DEBUG to trace each routing step
+logger = logging.getLogger("nodedesk")
+
+
+# Defining the structure state of the node desk
+# Nodes return only the keys they change; LangGraph merges them into the state
+@dataclass(slots=True)
+class NodeDeskState:
+    query: str | None = None
+    is_technical: bool | None = None
+    it_category: str | None = None
+    satisfaction_level: str | None = None
+    answer: str | None = None
+    ticket_created: bool = False
+    interaction_count: int = 0
+
+
+def apply_update(state: NodeDeskState, update: dict) -> NodeDeskState:
+    """Merge a node's partial update into the state in place"""
+    for key, value in update.items():
+        setattr(state, key, value)
+    return state
+
+
+def log_state(state: NodeDeskState) -> None:
+    """Log a compact view of the state (the answer is summarized by length)"""
+    logger.debug(
+        "state is_technical=%s it_category=%r satisfaction_level=%r answer_len=%d ticket_created=%s interaction_count=%d",
+        state.is_technical,
+        state.it_category,
+        state.satisfaction_level,
+        len(state.answer or ""),
+        state.ticket_created,
+        state.interaction_count,
+    )
+
+
+# Routing function
+def route_query(state: NodeDeskState) -> str:
+    """Route the query to the correct node based on the current state"""
+
+    # Force stop if too many interactions
+    if state.interaction_count >= 5:  # Reduced limit to prevent infinite loops
+        return "create_escalation_ticket"
+
+    # First interaction - check if technical
+    if state.is_technical is None:
+        return "check_technical_context"
+
+    # Non-technical query
+    if not state.is_technical:
+        return "respond_general"
+
+    # Technical query - provide guidance
+    if state.answer is None:
+        return "provide_technical_guidance"
+
+    # Check satisfaction after providing guidance
+    if state.satisfaction_level is None:
+        return "check_satisfaction"
+
+    # Route based on satisfaction
+    if state.satisfaction_level == "Satisfied":
+        return "create_resolved_ticket"
+    elif state.satisfaction_level == "Unsatisfied":
+        return "create_escalation_ticket"
+    else:  # Neutral - escalate after too many attempts
+        return "create_escalation_ticket"
+
+
+# Workflow loop
+def run_workflow(initial_query: str, nodes: Dict[str, Callable[[NodeDeskState], dict]]) -> NodeDeskState:
+    """Route the query through the given node functions until a ticket is created"""
+
+    # Initialize state
+    state = NodeDeskState(query=initial_query)
+
+    # Execute workflow
+    while not state.ticket_created:
+        next_node = route_query(state)
+        logger.debug("routing to=%s interaction_count=%d", next_node, state.interaction_count)
+        if logger.isEnabledFor(logging.DEBUG):
+            log_state(state)
+
+        apply_update(state, nodes[next_node](state))
+        state.interaction_count += 1
+
+        # Prevent infinite loops
+        if state.interaction_count > 5:
+            logger.warning("max interactions reached, escalating query=%r", state.query)
+            apply_update(state, nodes["create_escalation_ticket"](state))
+            break
+
+    return state
@@ -0,0 +1,160 @@
+import io
+import math
+from typing import Dict, List
+
+# Known IT categories, used to normalize the raw classifier output
+# (e.g. "2. Software" -> "Software")
+IT_CATEGORIES = ["Hardware", "Software", "Network", "Security", "Email", "Database", "Non-Technical"]
+
+# Ticket statuses tracked by the analytics
+TICKET_STATUSES = ["Open", "Resolved", "Escalated", "Pending"]
+
+
+def normalize_category(it_category: str | None) -> str:
+    """Map the raw classifier output onto one of the known IT categories"""
+    if not it_category:
+        return "Unknown"
+    # The model may explain its choice, so take the category mentioned first
+    text = it_category.lower()
+    positions = {category: text.find(category.lower()) for category in IT_CATEGORIES}
+    found = [category for category, position in positions.items() if position >= 0]
+    if not found:
+        return "Other"
+    return min(found, key=positions.__getitem__)
+
+
+# Streaming latency sketch
+class LatencySketch:
+    """Log-bucketed quantile sketch with bounded relative error.
+
+    Each value is counted in a bucket whose bounds grow geometrically, so
+    memory depends on the range of latencies seen, not on how many were seen.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a single (positive) value to the sketch"""
+        value = max(value, 1e-9)
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-th quantile (0 <= q <= 1), or None if empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i]
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+# Incrementally maintained ticket analytics
+class TicketAnalytics:
+    """Aggregates over tickets, updated as each ticket is written.
+
+    Counts, resolution rate and latency percentiles are kept up to date on
+    every write, so reading a snapshot never scans the ticket history.
+    Ticket rows are also kept column by column for bulk export; the export is
+    cached and only rebuilt after a write.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all tickets and aggregates"""
+        self.version += 1
+        self._export: bytes | None = None
+        self._export_version = -1
+        self.total = 0
+        self.status_counts: Dict[str, int] = {status: 0 for status in TICKET_STATUSES}
+        self.category_counts: Dict[str, int] = {}
+        self.latency = LatencySketch()
+        self.columns: Dict[str, List] = {
+            "ticket_id": [],
+            "created_at": [],
+            "query": [],
+            "answer": [],
+            "it_category": [],
+            "status": [],
+            "satisfaction_level": [],
+            "latency_ms": [],
+        }
+
+    def record_ticket(self, query: str, answer: str | None, it_category: str | None,
+                      status: str, satisfaction_level: str | None,
+                      latency_ms: float, created_at: str) -> int:
+        """Record a newly created ticket and return its id"""
+        ticket_id = self.total
+        category = normalize_category(it_category)
+        self.version += 1
+
+        self.total += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.category_counts[category] = self.category_counts.get(category, 0) + 1
+        self.latency.add(latency_ms)
+
+        self.columns["ticket_id"].append(ticket_id)
+        self.columns["created_at"].append(created_at)
+        self.columns["query"].append(query)
+        self.columns["answer"].append(answer)
+        self.columns["it_category"].append(category)
+        self.columns["status"].append(status)
+        self.columns["satisfaction_level"].append(satisfaction_level)
+        self.columns["latency_ms"].append(latency_ms)
+        return ticket_id
+
+    def update_status(self, ticket_id: int, status: str, satisfaction_level: str | None) -> None:
+        """Move a ticket to a new status, adjusting the counts in place"""
+        previous = self.columns["status"][ticket_id]
+        self.version += 1
+        self.status_counts[previous] -= 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.columns["status"][ticket_id] = status
+        self.columns["satisfaction_level"][ticket_id] = satisfaction_level
+
+    def snapshot(self) -> dict:
+        """Return the current aggregates without touching the ticket history"""
+        resolved = self.status_counts.get("Resolved", 0)
+        return {
+            "total": self.total,
+            "by_status": dict(self.status_counts),
+            "by_category": dict(self.category_counts),
+            "resolution_rate": resolved / self.total if self.total else 0.0,
+            "latency_ms": {
+                "p50": self.latency.quantile(0.50),
+                "p90": self.latency.quantile(0.90),
+                "p99": self.latency.quantile(0.99),
+            },
+        }
+
+    def to_parquet(self) -> bytes:
+        """Export all tickets as a Parquet file (pyarrow ships with Streamlit)"""
+        # Reuse the last export until a ticket is written or updated
+        if self._export is not None and self._export_version == self.version:
+            return self._export
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        pq.write_table(pa.table(self.columns), buffer)
+        self._export = buffer.getvalue()
+        self._export_version = self.version
+        return self._export